@@ -1,15 +1,34 @@
 import argparse
+import contextlib
+import io
 import os
-import re
 import sys
-import yaml
 
-from prettytable import PrettyTable
+from concurrent.futures import ProcessPoolExecutor
 
 """
 Defaults
+
+Validation failure messages, keyed by reason code. Messages are only
+formatted for the failures that are actually reported.
 """
-WEBHOOK_REGEX = "^[a-zA-Z0-9]*$"
+FAILURE_REASONS = {
+    "rwv_invalid": "'{resource}' webhook token contains non-alphanumeric characters",
+    "cwv_mismatch": (
+        "'create-webhooks' job '{resource}' has a different token to the resource"
+    ),
+    "cwv_missing": (
+        "'{resource}' missing 'create-webhooks' job or webhook token parameter "
+        "not set"
+    ),
+    "dwv_mismatch": (
+        "'delete-webhooks' job '{resource}' has a different token to the resource"
+    ),
+    "dwv_missing": (
+        "'{resource}' missing 'delete-webhooks' job or webhook token parameter "
+        "not set"
+    ),
+}
 
 """
 Classes & Functions
@@ -24,19 +43,25 @@ class colours:
     end = "\033[0m"
 
 
-def format_output(message="", style="info") -> None:
-    prefix = ""
+"""
+Message prefixes are built once for each supported output style
+"""
+STYLE_PREFIXES = {
+    style: f"{colour}{style.capitalize()}:{colours.end} "
+    for style, colour in (
+        ("error", colours.red),
+        ("info", colours.blue),
+        ("warn", colours.yellow),
+    )
+}
 
-    if style == "error":
-        prefix = f"{colours.red}{style.capitalize()}:{colours.end} "
 
-    if style == "info":
-        prefix = f"{colours.blue}{style.capitalize()}:{colours.end} "
+def format_message(message="", style="info") -> str:
+    return STYLE_PREFIXES.get(style, "") + message
 
-    if style == "warn":
-        prefix = f"{colours.yellow}{style.capitalize()}:{colours.end} "
 
-    print(prefix + message)
+def format_output(message="", style="info") -> None:
+    sys.stdout.write(format_message(message, style) + "\n")
 
 
 def read_pipelines_list_from_file(pipeline_file) -> list:
@@ -59,16 +84,76 @@ def read_pipelines_list_from_file(pipeline_file) -> list:
     return pipelines_list
 
 
-def load_pipeline_config(pipeline_config_file_path: str) -> object:
+def project_pipeline_config(pipeline_config: object) -> dict:
+    """
+    Reduces a parsed pipeline document to the webhook details needed for
+    validation, so the full document isn't held in memory (or in the parse
+    cache) while the results are checked and displayed. Only resources and
+    'create-webhooks'/'delete-webhooks' job steps that set a webhook token
+    are kept, as (resource name, webhook token) pairs. The 'jobs' and
+    'resources' keys are only present if they exist in the original document.
+    """
+    pipeline_projection = {}
+    if "resources" in pipeline_config:
+        pipeline_projection["resources"] = [
+            (resource["name"], resource_webhook_token)
+            for resource in pipeline_config["resources"]
+            if (resource_webhook_token := resource.get("webhook_token")) is not None
+        ]
+
+    if "jobs" in pipeline_config:
+        webhook_jobs = {"create-webhooks": [], "delete-webhooks": []}
+        for job in pipeline_config["jobs"]:
+            webhook_job_steps = webhook_jobs.get(job["name"])
+            if webhook_job_steps is not None:
+                for job_plan in job["plan"]:
+                    job_params = job_plan["params"]
+                    job_webhook_token = job_params.get("webhook_token")
+                    if job_webhook_token is not None:
+                        webhook_job_steps.append(
+                            (job_params["resource_name"], job_webhook_token)
+                        )
+        pipeline_projection["jobs"] = webhook_jobs
+
+    return pipeline_projection
+
+
+def parse_pipeline_config(pipeline_config_file_path: str) -> tuple:
+    """
+    Returns a tuple of webhook projections, one for each YAML document in the
+    pipeline file, so multi-document files are handled in a single parse.
+    Empty documents are skipped and a file with no documents is treated as a
+    single empty pipeline so that it fails validation.
+
+    PyYAML is imported here rather than at module level so that invocations
+    such as --help don't pay its import cost. The libyaml-backed loader is
+    used when PyYAML has been built with it, otherwise the pure-Python safe
+    loader is used.
+    """
+    import yaml
+
+    with open(pipeline_config_file_path, "rb") as file:
+        pipeline_config_bytes = file.read()
+
+    pipeline_documents = yaml.load_all(
+        pipeline_config_bytes, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    )
+    pipeline_projections = tuple(
+        project_pipeline_config(pipeline_config)
+        for pipeline_config in pipeline_documents
+        if pipeline_config is not None
+    )
+
+    return pipeline_projections or (project_pipeline_config({}),)
+
+
+def load_pipeline_config(pipeline_config_file_path: str) -> tuple:
     """
     The file must exist before we load it. Once loaded the
-    entire python object is returned.
+    webhook projections of the pipeline documents are returned.
     """
     if os.path.isfile(pipeline_config_file_path):
-        with open(pipeline_config_file_path, "r") as file:
-            pipeline_config = yaml.safe_load(file)
-
-        return pipeline_config
+        return parse_pipeline_config(pipeline_config_file_path)
 
     else:
         format_output("The specified pipeline file could not be found", "error")
@@ -95,69 +180,56 @@ def validate_pipeline_config(pipeline_config: object) -> int:
     return validation_error
 
 
-def parse_pipeline_resources(pipeline_config: object, webhook_dict: dict) -> None:
-    for resource in pipeline_config["resources"]:
-        resource_name = resource["name"]
-        if "webhook_token" in resource:
-            if resource["webhook_token"] is not None:
-                resource_webhook_token = resource["webhook_token"]
-                webhook_dict[resource_name] = {"rwt": resource_webhook_token}
-
+def validate_webhook_token(webhook_token: str) -> int:
+    """
+    A valid webhook token must only contain ASCII alphanumeric characters
+    0: Valid
+    1: Invalid
+    """
+    if not webhook_token or (webhook_token.isascii() and webhook_token.isalnum()):
+        return 0
+    return 1
 
-def parse_pipeline_jobs(pipeline_config: object, webhook_dict: dict) -> None:
-    for job in pipeline_config["jobs"]:
-        if job["name"] == "create-webhooks":
-            for create_plan in job["plan"]:
-                if "webhook_token" in create_plan["params"]:
-                    create_webhook_token = create_plan["params"]["webhook_token"]
-                    webhook_dict[create_plan["params"]["resource_name"]].update(
-                        {"cwt": create_webhook_token}
-                    )
-        if job["name"] == "delete-webhooks":
-            for delete_plan in job["plan"]:
-                if "webhook_token" in delete_plan["params"]:
-                    delete_webhook_token = delete_plan["params"]["webhook_token"]
-                    webhook_dict[delete_plan["params"]["resource_name"]].update(
-                        {"dwt": delete_webhook_token}
-                    )
 
+def parse_pipeline_resources(pipeline_config: object) -> dict:
+    """
+    Returns a dict of webhooked resources keyed by resource name. The
+    'create-webhooks' and 'delete-webhooks' results default to 2 (no
+    webhook job found) until parse_pipeline_jobs finds a matching job step.
+    """
+    return {
+        resource_name: {
+            "rwt": resource_webhook_token,
+            "rwv": validate_webhook_token(resource_webhook_token),
+            "cwv": 2,
+            "dwv": 2,
+        }
+        for resource_name, resource_webhook_token in pipeline_config["resources"]
+    }
 
-def validate_webhooks(webhooks_dict: dict) -> None:
-    for resource in webhooks_dict:
-        resource_webhooks = webhooks_dict[resource]
-        """
-        A valid webhook token must only contain alphanumeric characters
-        0: Valid
-        1: Invalid
-        """
-        valid_webhook = re.search(WEBHOOK_REGEX, resource_webhooks["rwt"])
-        if valid_webhook:
-            webhooks_dict[resource].update({"rwv": 0})
-        else:
-            webhooks_dict[resource].update({"rwv": 1})
 
-        """
-        The webhook tokens specified in 'create-webhooks' and 'delete-webhooks'
-        must match the token specified on the resource
-        0: Match
-        1: No match
-        2: No webhook job found
-        """
-        if "cwt" in resource_webhooks:
-            if resource_webhooks["cwt"] == resource_webhooks["rwt"]:
-                webhooks_dict[resource].update({"cwv": 0})
-            else:
-                webhooks_dict[resource].update({"cwv": 1})
-        else:
-            webhooks_dict[resource].update({"cwv": 2})
+def parse_pipeline_jobs(pipeline_config: object, webhook_dict: dict) -> None:
+    """
+    The webhook tokens specified in 'create-webhooks' and 'delete-webhooks'
+    must match the token specified on the resource
+    0: Match
+    1: No match
+    2: No webhook job found
+    """
+    webhook_jobs = pipeline_config["jobs"]
+    for resource_name, create_webhook_token in webhook_jobs["create-webhooks"]:
+        resource_webhooks = webhook_dict[resource_name]
+        resource_webhooks["cwt"] = create_webhook_token
+        resource_webhooks["cwv"] = (
+            0 if create_webhook_token == resource_webhooks["rwt"] else 1
+        )
 
-        if "dwt" in resource_webhooks:
-            if resource_webhooks["dwt"] == resource_webhooks["rwt"]:
-                webhooks_dict[resource].update({"dwv": 0})
-            else:
-                webhooks_dict[resource].update({"dwv": 1})
-        else:
-            webhooks_dict[resource].update({"dwv": 2})
+    for resource_name, delete_webhook_token in webhook_jobs["delete-webhooks"]:
+        resource_webhooks = webhook_dict[resource_name]
+        resource_webhooks["dwt"] = delete_webhook_token
+        resource_webhooks["dwv"] = (
+            0 if delete_webhook_token == resource_webhooks["rwt"] else 1
+        )
 
 
 def display_results(webhooks_dict: dict) -> int:
@@ -168,13 +240,15 @@ def display_results(webhooks_dict: dict) -> int:
     """
     Find the length of the longest resource name so we can scale the results table
     """
-    resource_name_length = 0
-    for resource in webhooks_dict:
-        if len(resource) > resource_name_length:
-            resource_name_length = len(resource)
+    resource_name_length = max(
+        len("Resource name"), max(map(len, webhooks_dict), default=0)
+    )
 
-    webhooks_table = PrettyTable()
-    webhooks_table.field_names = ["Resource name", "Token valid", "Create matches", "Delete matches"]
+    output_lines = [
+        f"{'Resource name':<{resource_name_length}} | Token valid "
+        "| Create matches | Delete matches",
+        f"{'-' * (resource_name_length + 1)}|{'-' * 13}|{'-' * 16}|{'-' * 16}",
+    ]
 
     """
     Loop through and build the tabular output and track whether any
@@ -182,73 +256,137 @@ def display_results(webhooks_dict: dict) -> int:
     """
     resource_validation_failed = 0
     resource_failed_reasons = []
-    for resource in webhooks_dict:
+    for resource, resource_webhooks in webhooks_dict.items():
         """
         0: Valid token
         1: Invalid token
         """
-        if webhooks_dict[resource]["rwv"] == 0:
+        if resource_webhooks["rwv"] == 0:
             resource_webhook_valid = "✅"
         else:
             resource_webhook_valid = "❌"
             resource_validation_failed = 1
-            resource_failed_reasons.append(
-                f"'{resource}' webhook token contains non-alphanumeric characters"
-            )
+            resource_failed_reasons.append((resource, "rwv_invalid"))
 
         """
         0: Match
         1: No match
         2: No webhook job found
         """
-        if webhooks_dict[resource]["cwv"] == 0:
+        if resource_webhooks["cwv"] == 0:
             create_webhook_valid = "✅"
-        elif webhooks_dict[resource]["cwv"] == 1:
+        elif resource_webhooks["cwv"] == 1:
             create_webhook_valid = "❌"
             resource_validation_failed = 1
-            resource_failed_reasons.append(
-                f"'create-webhooks' job '{resource}' has a different token to the resource"
-            )
+            resource_failed_reasons.append((resource, "cwv_mismatch"))
         else:
             create_webhook_valid = "❓"
             resource_validation_failed = 1
-            resource_failed_reasons.append(
-                f"'{resource}' missing 'create-webhooks' job or webhook token parameter not set"
-            )
+            resource_failed_reasons.append((resource, "cwv_missing"))
 
-        if webhooks_dict[resource]["dwv"] == 0:
+        if resource_webhooks["dwv"] == 0:
             delete_webhook_valid = "✅"
-        elif webhooks_dict[resource]["dwv"] == 1:
+        elif resource_webhooks["dwv"] == 1:
             delete_webhook_valid = "❌"
             resource_validation_failed = 1
-            resource_failed_reasons.append(
-                f"'delete-webhooks' job '{resource}' has a different token to the resource"
-            )
+            resource_failed_reasons.append((resource, "dwv_mismatch"))
         else:
             delete_webhook_valid = "❓"
             resource_validation_failed = 1
-            resource_failed_reasons.append(
-                f"'{resource}' missing 'delete-webhooks' job or webhook token parameter not set"
+            resource_failed_reasons.append((resource, "dwv_missing"))
+
+        output_lines.append(
+            f"{resource:<{resource_name_length}} "
+            f"|      {resource_webhook_valid}     "
+            f"|       {create_webhook_valid}       "
+            f"|      {delete_webhook_valid}"
+        )
+
+    """
+    Emit the table and any failure reasons with a single write rather than
+    a print per line
+    """
+    if resource_validation_failed == 1:
+        output_lines.append("")
+        for resource, reason in resource_failed_reasons:
+            output_lines.append(
+                format_message(
+                    FAILURE_REASONS[reason].format(resource=resource), "warn"
+                )
             )
 
-        webhooks_table.add_row([resource, resource_webhook_valid, create_webhook_valid, delete_webhook_valid])
+    sys.stdout.write("\n".join(output_lines) + "\n")
+
+    return resource_validation_failed
 
-    print(webhooks_table)
 
-    if resource_validation_failed == 1:
+def validate_pipeline_document(pipeline_config: dict) -> bool:
+    """
+    Validates the webhooks of a single pipeline document and displays the
+    results. Returns True if validation failed.
+    """
+    if validate_pipeline_config(pipeline_config) != 0:
+        format_output("Pipeline does not appear to be a valid configuration", "warn")
+        return True
+
+    webhooks_dict = parse_pipeline_resources(pipeline_config)
+    if len(webhooks_dict) == 0:
+        format_output("No webhooked resources found")
+        return False
+
+    parse_pipeline_jobs(pipeline_config, webhooks_dict)
+    if display_results(webhooks_dict) == 0:
         print()
-        for reason in resource_failed_reasons:
-            format_output(reason, "warn")
+        format_output("Webhooks configuration check completed successfully")
+        return False
 
-    return resource_validation_failed
+    format_output("Webhooks validation failures were encountered", "warn")
+    return True
+
+
+def validate_pipeline(pipeline_file_path: str) -> tuple:
+    """
+    Validates a single pipeline configuration and returns a tuple of the
+    pipeline name, whether validation failed, the exit code requested if the
+    pipeline could not be loaded (otherwise None) and the captured output.
+    Output is captured rather than printed so that pipelines validated in
+    parallel can be reported in order. Each document in a multi-document
+    pipeline file is validated in turn.
+    """
+    pipeline_name = os.path.basename(pipeline_file_path)
+    validation_failed = False
+    exit_code = None
 
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        try:
+            print()
+            format_output(
+                "Checking webhooks configuration: "
+                f"{colours.bold}{pipeline_name}{colours.end}"
+            )
+            pipeline_documents = load_pipeline_config(pipeline_file_path)
+            for document_index, pipeline_config in enumerate(pipeline_documents):
+                if len(pipeline_documents) > 1:
+                    print()
+                    format_output(
+                        f"Checking document {colours.bold}{document_index + 1}"
+                        f"{colours.end} of {len(pipeline_documents)}"
+                    )
+
+                if validate_pipeline_document(pipeline_config):
+                    validation_failed = True
+        except SystemExit as err:
+            exit_code = err.code
 
-def print_validation_summary(validation_failure_list) -> None:
+    return pipeline_name, validation_failed, exit_code, output.getvalue()
+
+
+def print_validation_summary(validation_failures: set) -> None:
     print()
     print("-" * 80 + "\nValidation results summary\n" + "-" * 80)
-    if len(validation_failure_list) > 0:
+    if validation_failures:
         format_output("The following pipelines had validation failures", "error")
-        for failed_pipeline in validation_failure_list:
+        for failed_pipeline in sorted(validation_failures):
             format_output(f"{colours.bold}{failed_pipeline}{colours.end}", "error")
         sys.exit(1)
     else:
@@ -307,42 +445,35 @@ def main() -> None:
     else:
         pipelines_list = [args.pipeline[0]]
 
-    validation_failure_list = []
-    for pipeline in pipelines_list:
-        pipeline_file_path = os.path.join(
-            pipeline_base_dir, pipeline_deployment, pipeline_team, pipeline
-        )
-        pipeline_name_element_list = pipeline_file_path.rsplit("/", 1)
-        pipeline_name = pipeline_name_element_list[len(pipeline_name_element_list) - 1]
+    pipeline_file_paths = [
+        os.path.join(pipeline_base_dir, pipeline_deployment, pipeline_team, pipeline)
+        for pipeline in pipelines_list
+    ]
 
-        webhooks_dict = {}
-        print()
-        format_output(
-            f"Checking webhooks configuration: {colours.bold}{pipeline_name}{colours.end}"
-        )
-        pipeline_config = load_pipeline_config(pipeline_file_path)
-        if validate_pipeline_config(pipeline_config) == 0:
-            parse_pipeline_resources(pipeline_config, webhooks_dict)
-            if len(webhooks_dict) > 0:
-                parse_pipeline_jobs(pipeline_config, webhooks_dict)
-                validate_webhooks(webhooks_dict)
-                if display_results(webhooks_dict) == 0:
-                    print()
-                    format_output("Webhooks configuration check completed successfully")
-                else:
-                    validation_failure_list.append(pipeline_name)
-                    format_output(
-                        "Webhooks validation failures were encountered", "warn"
-                    )
-            else:
-                format_output("No webhooked resources found")
-        else:
-            validation_failure_list.append(pipeline_name)
-            format_output(
-                "Pipeline does not appear to be a valid configuration", "warn"
+    """
+    Pipelines are independent of one another, so multiple pipelines are
+    validated in parallel worker processes. Results are reported in the
+    order the pipelines were listed.
+    """
+    validation_failures = set()
+    with contextlib.ExitStack() as stack:
+        if len(pipeline_file_paths) > 1:
+            executor = stack.enter_context(ProcessPoolExecutor())
+            validation_results = executor.map(
+                validate_pipeline, pipeline_file_paths, chunksize=8
             )
+        else:
+            validation_results = map(validate_pipeline, pipeline_file_paths)
+
+        for pipeline_name, validation_failed, exit_code, output in validation_results:
+            sys.stdout.write(output)
+            if exit_code is not None:
+                sys.exit(exit_code)
+
+            if validation_failed:
+                validation_failures.add(pipeline_name)
 
-    print_validation_summary(validation_failure_list)
+    print_validation_summary(validation_failures)
 
 
 if __name__ == "__main__":
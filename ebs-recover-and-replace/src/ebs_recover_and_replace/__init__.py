@@ -1,13 +1,62 @@
 import argparse
 import botocore
 import boto3
+import contextlib
+import gzip
 import hashlib
 import json
 import os
 import sys
 import time
-
-from collections import Counter
+import zlib
+
+from botocore.config import Config
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+Plans are parsed with orjson when it is installed, falling back to the
+standard library json module
+"""
+try:
+    from orjson import loads as plan_loads
+except ImportError:
+    from json import loads as plan_loads
+
+"""
+EC2 client configuration. Adaptive retries back off when EC2 throttles
+requests, the larger connection pool allows for concurrent requests and
+TCP keepalive stops idle pooled connections being dropped while waiting
+on user input or a waiter
+"""
+EC2_CLIENT_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    max_pool_connections=32,
+    tcp_keepalive=True,
+)
+
+"""
+Waiters are cached per client and waiter name as building one re-reads
+the waiter model
+"""
+WAITER_CACHE = {}
+
+"""
+Accepted answers for yes/no prompts
+"""
+YES_ANSWERS = ("yes", "y")
+NO_ANSWERS = ("no", "n")
+
+"""
+With --cache, loaded plans that were re-validated within the cache TTL (in
+seconds) are not re-validated again. A marker file per plan signature records
+when it was last successfully re-validated, and is removed once the plan's
+restore is confirmed
+"""
+VALIDATION_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "ebs-recover-and-replace", "validated"
+)
+VALIDATION_CACHE_TTL = 60
 
 
 def separator(width=72):
@@ -18,22 +67,32 @@ def separator(width=72):
 def process_searchtags(searchtags):
     """
     Processes the searchtags provided on the command line and converts it to
-    a dict. First by splitting on the comma and then on the equals to form a
-    raw output. This is then processed further to remove all leading and
-    trailing whitespace from both the dictionary keys and the values.
+    a dict. First by splitting on the comma and then on the first equals, so
+    tag values may themselves contain an equals sign. All leading and
+    trailing whitespace is removed from both the dictionary keys and the
+    values in the same pass.
+    """
+    return {
+        k.strip(): v.strip()
+        for k, v in (pair.split("=", 1) for pair in searchtags.split(","))
+    }
+
+
+def get_waiter(ec2_client, waiter_name):
+    """
+    Returns the named waiter for the provided client, creating it on first use
     """
-    raw_dict = dict(pair.split("=") for pair in searchtags.split(","))
-    clean_dict = {k.strip(): v.strip() for k, v in raw_dict.items()}
-    return clean_dict
+    waiter_key = (id(ec2_client), waiter_name)
+    if waiter_key not in WAITER_CACHE:
+        WAITER_CACHE[waiter_key] = ec2_client.get_waiter(waiter_name)
+
+    return WAITER_CACHE[waiter_key]
 
 
 def validate_response(response):
-    if response["ResponseMetadata"]["HTTPStatusCode"] != 200:
-        sys.exit(
-            "Received {} error from AWS".format(
-                response["ResponseMetadata"]["HTTPStatusCode"]
-            )
-        )
+    status_code = response["ResponseMetadata"]["HTTPStatusCode"]
+    if status_code != 200:
+        sys.exit("Received {} error from AWS".format(status_code))
 
 
 def create_ec2_client(awsprofile, awsregion):
@@ -46,7 +105,7 @@ def create_ec2_client(awsprofile, awsregion):
     try:
         # Connect to EC2
         session = boto3.Session(profile_name=awsprofile)
-        ec2_client = session.client("ec2", awsregion)
+        ec2_client = session.client("ec2", awsregion, config=EC2_CLIENT_CONFIG)
         return ec2_client
 
     except botocore.exceptions.NoCredentialsError as nocrederr:
@@ -67,54 +126,66 @@ def query_ec2_instances(ec2_client, searchtags, instanceid=None):
     """
     print("Querying instances...")
     print("Search Tags:".ljust(20) + "{}".format(searchtags))
-    filters_list = []
-    for tagname, tagvalue in searchtags.items():
-        filters_list.append({"Name": "tag:" + tagname, "Values": [tagvalue]})
+    filters_list = [
+        {"Name": "tag:" + tagname, "Values": [tagvalue]}
+        for tagname, tagvalue in searchtags.items()
+    ]
 
     if instanceid is not None:
         filters_list.append({"Name": "instance-id", "Values": [instanceid]})
 
-    # Get information for all running instances
-    try:
-        running_instances = ec2_client.describe_instances(
-            Filters=filters_list,
-        )
-
-    except botocore.exceptions.UnauthorizedSSOTokenError as ssotokenerr:
-        sys.exit(ssotokenerr)
+    # Get information for all running instances, following any further
+    # pages of results
+    instance_pages = ec2_client.get_paginator("describe_instances").paginate(
+        Filters=filters_list,
+        PaginationConfig={"PageSize": 1000},
+    )
 
-    except botocore.exceptions.ProfileNotFound as profileerr:
-        sys.exit(profileerr)
+    instances = (
+        instance
+        for page in instance_pages
+        for reservation in page["Reservations"]
+        for instance in reservation["Instances"]
+    )
 
     instance_dict = {}
-    for reservation in running_instances["Reservations"]:
-        for instance in reservation["Instances"]:
+    try:
+        for instance in instances:
             instance_id = instance["InstanceId"]
             private_ip = instance["PrivateIpAddress"]
 
-            block_dev_list = []
-            for block_dev in instance["BlockDeviceMappings"]:
-                block_dev_list.append(
-                    {
-                        "DeviceName": block_dev["DeviceName"],
-                        "VolumeId": block_dev["Ebs"]["VolumeId"],
-                    }
-                )
+            # Block devices are keyed by device name, which is unique per
+            # instance
+            block_devs = {
+                block_dev["DeviceName"]: {"VolumeId": block_dev["Ebs"]["VolumeId"]}
+                for block_dev in instance["BlockDeviceMappings"]
+            }
 
-            for tags in instance["Tags"]:
-                if tags["Key"] == "Name":
-                    instance_name = tags["Value"]
+            # Instances without any tags are returned without a Tags key
+            instance_name = next(
+                (
+                    tag["Value"]
+                    for tag in instance.get("Tags", [])
+                    if tag["Key"] == "Name"
+                ),
+                "",
+            )
 
             instance_dict[instance_id] = {
                 "Name": instance_name,
                 "IPAddress": private_ip,
-                "BlockDevs": block_dev_list,
+                "BlockDevs": block_devs,
             }
 
-    instances_num = len(Counter(instance_dict))
+    except botocore.exceptions.UnauthorizedSSOTokenError as ssotokenerr:
+        sys.exit(ssotokenerr)
+
+    except botocore.exceptions.ProfileNotFound as profileerr:
+        sys.exit(profileerr)
+
+    instances_num = len(instance_dict)
 
     if instances_num == 0:
-        ec2_client.close()
         sys.exit("No results returned")
     else:
         return instance_dict
@@ -125,7 +196,8 @@ def get_instance_choice(instance_dict):
     If more than 1 instance is returned on a query, the user must specify on which
     instance the operations are to take place on.
     """
-    print("Instances Found:".ljust(20) + "{}".format(len(Counter(instance_dict))))
+    instances_num = len(instance_dict)
+    print("Instances Found:".ljust(20) + "{}".format(instances_num))
     print("Select an instance to continue:")
     for index, instance_id in enumerate(instance_dict):
         instance_name = instance_dict[instance_id]["Name"]
@@ -135,30 +207,21 @@ def get_instance_choice(instance_dict):
         )
 
     print()
+    warn_msg = "Selection must be a number from 0 to {}".format(instances_num - 1)
     while True:
         selection_raw = input("Instance Selection:".ljust(20))
         try:
             selection_int = int(selection_raw)
         except ValueError:
-            print(
-                "Selection must be a number from 0 to {}".format(
-                    len(Counter(instance_dict)) - 1
-                )
-            )
+            print(warn_msg)
             continue
 
-        if not (0 <= selection_int <= len(Counter(instance_dict)) - 1):
-            print(
-                "Selection must be a number from 0 to {}".format(
-                    len(Counter(instance_dict)) - 1
-                )
-            )
+        if not (0 <= selection_int < instances_num):
+            print(warn_msg)
             continue
         else:
-            for index, instance_id in enumerate(instance_dict):
-                if index == selection_int:
-                    selected_instance_id = instance_id
-                    selected_instance_dict = instance_dict[instance_id]
+            selected_instance_id = list(instance_dict)[selection_int]
+            selected_instance_dict = instance_dict[selected_instance_id]
 
             instance_dict.clear()
             instance_dict[selected_instance_id] = selected_instance_dict
@@ -172,24 +235,17 @@ def get_volume_choice(instance_dict):
     for volume snapshots
     """
 
-    for index, instance_id in enumerate(instance_dict):
+    for instance_id, instance_data in instance_dict.items():
+        block_devs = instance_data["BlockDevs"]
+        devices_num = len(block_devs)
         print("Instance ID:".ljust(20) + "{}".format(instance_id))
-        print(
-            "Instance Name:".ljust(20) + "{}".format(instance_dict[instance_id]["Name"])
-        )
-        print(
-            "IP Address:".ljust(20)
-            + "{}".format(instance_dict[instance_id]["IPAddress"])
-        )
-        print(
-            "Block Devices:".ljust(20)
-            + "{}\n".format(len(instance_dict[instance_id]["BlockDevs"]))
-        )
+        print("Instance Name:".ljust(20) + "{}".format(instance_data["Name"]))
+        print("IP Address:".ljust(20) + "{}".format(instance_data["IPAddress"]))
+        print("Block Devices:".ljust(20) + "{}\n".format(devices_num))
 
         print("Select an option to continue:")
-        for index, device in enumerate(instance_dict[instance_id]["BlockDevs"]):
+        for index, (device_node, device) in enumerate(block_devs.items()):
             volume_id = device["VolumeId"]
-            device_node = device["DeviceName"]
             if "sda" in device_node:
                 device_message = "** ROOT **"
             else:
@@ -203,142 +259,158 @@ def get_volume_choice(instance_dict):
         print("    [A] All block devices")
 
         print()
+        warn_msg = (
+            "Selection must be a number from 0 to {} or A for all block devices".format(
+                devices_num - 1
+            )
+        )
         while True:
             selection_raw = input("Device Selection: ".ljust(20))
 
-            if selection_raw == "A" or selection_raw == "a":
+            if selection_raw in ("A", "a"):
                 print("All block devices selected")
                 return instance_dict
             else:
                 try:
                     selection_int = int(selection_raw)
                 except ValueError:
-                    print(
-                        "Selection must be a number from 0 to {} or A for all block devices".format(
-                            len(instance_dict[instance_id]["BlockDevs"]) - 1
-                        )
-                    )
+                    print(warn_msg)
                     continue
 
-                if not (
-                    0
-                    <= selection_int
-                    <= len(instance_dict[instance_id]["BlockDevs"]) - 1
-                ):
-                    print(
-                        "Selection must be a number from 0 to {} or A for all block devices".format(
-                            len(instance_dict[instance_id]["BlockDevs"]) - 1
-                        )
-                    )
+                if not (0 <= selection_int < devices_num):
+                    print(warn_msg)
                     continue
                 else:
-                    for index, device in enumerate(
-                        instance_dict[instance_id]["BlockDevs"]
-                    ):
-                        if index != selection_int:
-                            del instance_dict[instance_id]["BlockDevs"][index]
+                    selected_device_name = list(block_devs)[selection_int]
+                    instance_data["BlockDevs"] = {
+                        selected_device_name: block_devs[selected_device_name]
+                    }
 
                     return instance_dict
 
 
-def get_volume_data(ec2_client, instance_dict):
+def get_volume_data(ec2_client, instance_dict, batch_size=500):
     """
     Returns additional data about each chosen volume, such as encryption status
-    availability zone and capacity
+    availability zone and capacity. Volumes are described in batches of up to
+    `batch_size` IDs per request rather than one request per volume.
     """
     print("Updating volume data...")
 
+    volume_ids = []
     for instance_id in instance_dict:
-        for block_index, block_device in enumerate(
-            instance_dict[instance_id]["BlockDevs"]
-        ):
-            device_name = block_device["DeviceName"]
-            volume_id = block_device["VolumeId"]
+        for device_name, block_device in instance_dict[instance_id][
+            "BlockDevs"
+        ].items():
             print(
-                "Querying Volume:".ljust(20) + "{} ({})".format(volume_id, device_name)
+                "Querying Volume:".ljust(20)
+                + "{} ({})".format(block_device["VolumeId"], device_name)
             )
-            volume_data = ec2_client.describe_volumes(VolumeIds=[volume_id])
-
-            for volume in volume_data["Volumes"]:
-                instance_dict[instance_id]["BlockDevs"][block_index].update(
-                    {
-                        "AvailabilityZone": volume["AvailabilityZone"],
-                        "Encrypted": volume["Encrypted"],
-                        "Size": volume["Size"],
-                        "VolumeType": volume["VolumeType"],
-                    }
-                )
+            volume_ids.append(block_device["VolumeId"])
 
-                if volume["Encrypted"]:
-                    instance_dict[instance_id]["BlockDevs"][block_index].update(
-                        {"KmsKeyId": volume["KmsKeyId"]}
-                    )
-                else:
-                    instance_dict[instance_id]["BlockDevs"][block_index].update(
-                        {"KmsKeyId": ""}
-                    )
+    volumes_paginator = ec2_client.get_paginator("describe_volumes")
+    volumes_by_id = {}
+    for batch_start in range(0, len(volume_ids), batch_size):
+        for page in volumes_paginator.paginate(
+            VolumeIds=volume_ids[batch_start : batch_start + batch_size]
+        ):
+            for volume in page["Volumes"]:
+                volumes_by_id[volume["VolumeId"]] = volume
+
+    for instance_id in instance_dict:
+        for block_device in instance_dict[instance_id]["BlockDevs"].values():
+            volume = volumes_by_id[block_device["VolumeId"]]
+            block_device.update(
+                {
+                    "AvailabilityZone": volume["AvailabilityZone"],
+                    "Encrypted": volume["Encrypted"],
+                    "Size": volume["Size"],
+                    "VolumeType": volume["VolumeType"],
+                    "KmsKeyId": volume.get("KmsKeyId", "")
+                    if volume["Encrypted"]
+                    else "",
+                }
+            )
 
     return instance_dict
 
 
-def query_ebs_snapshots(ec2_client, instance_dict, max_results=5):
+def describe_volume_snapshots(ec2_client, volume_ids):
     """
-    Queries for any EBS snapshots based on a provided EBS volume ID. If any are
-    found, the `max_results` most recent snapshots are returned.
+    Describes the snapshots of the provided volumes using a single request
+    filtered on all of the volume IDs, returning the snapshots grouped by
+    volume ID
+    """
+    snapshot_pages = ec2_client.get_paginator("describe_snapshots").paginate(
+        Filters=[{"Name": "volume-id", "Values": volume_ids}],
+        OwnerIds=["self"],
+        PaginationConfig={"PageSize": 1000},
+    )
+
+    snapshots_by_volume = defaultdict(list)
+    for page in snapshot_pages:
+        for snapshot in page["Snapshots"]:
+            snapshots_by_volume[snapshot["VolumeId"]].append(snapshot)
+
+    return snapshots_by_volume
+
+
+def query_ebs_snapshots(
+    ec2_client, instance_dict, max_results=5, snapshots_by_volume=None
+):
+    """
+    Queries for any EBS snapshots of the selected EBS volumes. If any are
+    found, the `max_results` most recent snapshots of each volume are
+    returned. Volumes without snapshots are omitted. Snapshots already
+    described with describe_volume_snapshots can be provided to avoid
+    querying them again.
     """
     print("Querying EBS snapshots...")
 
-    omit_indexes = []
+    if snapshots_by_volume is None:
+        volume_ids = [
+            block_device["VolumeId"]
+            for instance_id in instance_dict
+            for block_device in instance_dict[instance_id]["BlockDevs"].values()
+        ]
+        snapshots_by_volume = describe_volume_snapshots(ec2_client, volume_ids)
+
     for instance_id in instance_dict:
-        for block_index, block_device in enumerate(
-            instance_dict[instance_id]["BlockDevs"]
-        ):
-            device_name = block_device["DeviceName"]
+        block_devs = instance_dict[instance_id]["BlockDevs"]
+        for device_name, block_device in list(block_devs.items()):
             volume_id = block_device["VolumeId"]
             print("Source Volume:".ljust(20) + "{} ({})".format(volume_id, device_name))
-            snapshot_data = ec2_client.describe_snapshots(
-                Filters=[{"Name": "volume-id", "Values": [volume_id]}],
-                OwnerIds=["self"],
-                MaxResults=max_results,
-            )
 
-            if len(snapshot_data["Snapshots"]) == 0:
-                print(
-                    "Snapshots Found:".ljust(20)
-                    + "{} - Omitting Volume".format(len(snapshot_data["Snapshots"]))
-                )
-                omit_indexes.append(block_index)
+            volume_snapshots = sorted(
+                snapshots_by_volume[volume_id],
+                key=lambda snapshot: snapshot["StartTime"],
+                reverse=True,
+            )[:max_results]
 
-            if len(snapshot_data["Snapshots"]) > 0:
+            if len(volume_snapshots) == 0:
                 print(
                     "Snapshots Found:".ljust(20)
-                    + "{}".format(len(snapshot_data["Snapshots"]))
-                )
-                instance_dict[instance_id]["BlockDevs"][block_index].update(
-                    {"Snapshots": len(snapshot_data["Snapshots"])}
-                )
-
-                snapshot_list = []
-                for snapshot in snapshot_data["Snapshots"]:
-                    if snapshot["VolumeId"] == volume_id:
-                        snapshot_id = snapshot["SnapshotId"]
-                        snapshot_starttime = "{}".format(snapshot["StartTime"])
-                        snapshot_list.append(
-                            {"SnapshotId": snapshot_id, "StartTime": snapshot_starttime}
-                        )
-
-                instance_dict[instance_id]["BlockDevs"][block_index].update(
-                    {"SnapshotData": snapshot_list}
+                    + "{} - Omitting Volume".format(len(volume_snapshots))
                 )
+                del block_devs[device_name]
+                continue
 
-    omit_indexes.reverse()
-    for instance_id in instance_dict:
-        for index in omit_indexes:
-            del instance_dict[instance_id]["BlockDevs"][index]
+            print("Snapshots Found:".ljust(20) + "{}".format(len(volume_snapshots)))
+            block_device.update(
+                {
+                    "Snapshots": len(volume_snapshots),
+                    "SnapshotData": [
+                        {
+                            "SnapshotId": snapshot["SnapshotId"],
+                            "StartTime": "{}".format(snapshot["StartTime"]),
+                        }
+                        for snapshot in volume_snapshots
+                    ],
+                }
+            )
 
         if len(instance_dict[instance_id]["BlockDevs"]) == 0:
             separator()
-            ec2_client.close()
             sys.exit("Error: No valid snapshots found")
 
     return instance_dict
@@ -349,20 +421,16 @@ def get_snapshot_choice(instance_dict):
     Present the volume and available snapshots to the user so a single
     snapshot per volume can be selected for restore.
     """
-    for instance_id in instance_dict:
-        for block_index, block_device in enumerate(
-            instance_dict[instance_id]["BlockDevs"]
-        ):
-            device_name = block_device["DeviceName"]
+    for instance_data in instance_dict.values():
+        for device_name, block_device in instance_data["BlockDevs"].items():
             volume_id = block_device["VolumeId"]
+            volume_snapshots = block_device["SnapshotData"]
             print()
             print("Source Volume:".ljust(20) + "{} ({})".format(volume_id, device_name))
             print()
             print("Select a snapshot to continue:")
 
-            for snapshot_index, snapshot_data in enumerate(
-                block_device["SnapshotData"]
-            ):
+            for snapshot_index, snapshot_data in enumerate(volume_snapshots):
                 snapshot_id = snapshot_data["SnapshotId"]
                 snapshot_starttime = snapshot_data["StartTime"]
                 print(
@@ -371,42 +439,26 @@ def get_snapshot_choice(instance_dict):
                     )
                 )
 
-            omit_indexes = []
             print()
+            snapshots_num = len(volume_snapshots)
+            warn_msg = "Selection must be a number from 0 to {}".format(
+                snapshots_num - 1
+            )
             while True:
                 selection_raw = input("Snapshot Selection: ".ljust(20))
 
                 try:
                     selection_int = int(selection_raw)
                 except ValueError:
-                    print(
-                        "Selection must be a number from 0 to {}".format(
-                            len(block_device["SnapshotData"]) - 1
-                        )
-                    )
+                    print(warn_msg)
                     continue
 
-                if not (0 <= selection_int <= len(block_device["SnapshotData"]) - 1):
-                    print(
-                        "Selection must be a number from 0 to {}".format(
-                            len(block_device["SnapshotData"]) - 1
-                        )
-                    )
+                if not (0 <= selection_int < snapshots_num):
+                    print(warn_msg)
                     continue
                 else:
                     print("Snapshot {} selected".format(selection_int))
-                    for snapshot_index, snapshot_data in enumerate(
-                        block_device["SnapshotData"]
-                    ):
-                        if snapshot_index != selection_int:
-                            omit_indexes.append(snapshot_index)
-
-                    omit_indexes.reverse()
-                    for snapshot_index, snapshot_data in enumerate(
-                        block_device["SnapshotData"]
-                    ):
-                        for omit_index in omit_indexes:
-                            del block_device["SnapshotData"][omit_index]
+                    block_device["SnapshotData"] = [volume_snapshots[selection_int]]
 
                     break
 
@@ -438,12 +490,12 @@ NOTE: The original volumes will continue to exist. No resources will be removed.
 
         print()
         while True:
-            answer_raw = input("Switch Volumes:".ljust(20))
+            answer = input("Switch Volumes:".ljust(20)).lower()
 
-            if answer_raw.lower() == "yes":
+            if answer in YES_ANSWERS:
                 instance_dict[instance_id].update({"SwitchVols": True})
                 break
-            elif answer_raw.lower() == "no":
+            elif answer in NO_ANSWERS:
                 instance_dict[instance_id].update({"SwitchVols": False})
                 break
             else:
@@ -453,49 +505,49 @@ NOTE: The original volumes will continue to exist. No resources will be removed.
     return instance_dict
 
 
+"""
+Column layout of the volume table shown for final confirmation
+"""
+CONFIRMATION_ROW_FORMAT = "{:<25}{:<15}{:<25}{}"
+
+
 def get_user_confirmation(instance_dict):
     """
     Confirm all the data we now have for the user to make a final confirmation
     before commiting any EBS and EC2 operations.
     """
 
-    for instance_id in instance_dict:
+    for instance_id, instance_data in instance_dict.items():
         print("Instance ID:".ljust(20) + "{}".format(instance_id))
-        print(
-            "Instance Name:".ljust(20) + "{}".format(instance_dict[instance_id]["Name"])
-        )
-        print(
-            "IP Address:".ljust(20)
-            + "{}".format(instance_dict[instance_id]["IPAddress"])
-        )
+        print("Instance Name:".ljust(20) + "{}".format(instance_data["Name"]))
+        print("IP Address:".ljust(20) + "{}".format(instance_data["IPAddress"]))
         print()
         print(
-            "Volume ID".ljust(25)
-            + "Device Node".ljust(15)
-            + "Snapshot ID".ljust(25)
-            + "Snapshot Date"
+            CONFIRMATION_ROW_FORMAT.format(
+                "Volume ID", "Device Node", "Snapshot ID", "Snapshot Date"
+            )
         )
-        for block_device in instance_dict[instance_id]["BlockDevs"]:
+        for device_name, block_device in instance_data["BlockDevs"].items():
+            selected_snapshot = block_device["SnapshotData"][0]
             print(
-                "{}".format(block_device["VolumeId"]).ljust(25)
-                + "{}".format(block_device["DeviceName"]).ljust(15)
-                + "{}".format(block_device["SnapshotData"][0]["SnapshotId"]).ljust(25)
-                + "{}".format(block_device["SnapshotData"][0]["StartTime"])
+                CONFIRMATION_ROW_FORMAT.format(
+                    block_device["VolumeId"],
+                    device_name,
+                    selected_snapshot["SnapshotId"],
+                    selected_snapshot["StartTime"],
+                )
             )
 
         print()
-        print(
-            "Switch Volumes:".ljust(20)
-            + "{}".format(instance_dict[instance_id]["SwitchVols"])
-        )
+        print("Switch Volumes:".ljust(20) + "{}".format(instance_data["SwitchVols"]))
         print()
         print("Proceeed with the chosen options?")
         print()
         while True:
-            answer_raw = input("Proceed:".ljust(20))
-            if answer_raw.lower() == "yes":
+            answer = input("Proceed:".ljust(20)).lower()
+            if answer in YES_ANSWERS:
                 return True
-            elif answer_raw.lower() == "no":
+            elif answer in NO_ANSWERS:
                 return False
             else:
                 print('Please answer with "yes" or "no"')
@@ -503,53 +555,51 @@ def get_user_confirmation(instance_dict):
 
 
 def restore_ebs_volume(
-    ec2_client, block_device, searchtags_dict, wait_delay=15, wait_attempts=40
+    ec2_client,
+    device_name,
+    block_device,
+    searchtags_dict,
+    wait_delay=15,
+    wait_attempts=40,
 ):
     """
     Creates a new EBS volume based on a provided snapshot ID.
     The new volume ID is returned once creation has been completed.
     """
     print()
-    device_name = block_device["DeviceName"]
     snapshot_id = block_device["SnapshotData"][0]["SnapshotId"]
     tags_list = [
         {"Key": "DeviceName", "Value": device_name},
         {"Key": "Restored", "Value": "true"},
         {"Key": "SourceSnapshot", "Value": snapshot_id},
+        *(
+            {"Key": tagname, "Value": tagvalue}
+            for tagname, tagvalue in searchtags_dict.items()
+        ),
     ]
 
-    for tagname, tagvalue in searchtags_dict.items():
-        tags_list.append({"Key": tagname, "Value": tagvalue})
-
     print(
         "Initiating restore from {} for {}... ".format(snapshot_id, device_name),
     )
+    create_volume_params = {
+        "AvailabilityZone": block_device["AvailabilityZone"],
+        "Encrypted": block_device["Encrypted"],
+        "Size": block_device["Size"],
+        "SnapshotId": snapshot_id,
+        "VolumeType": block_device["VolumeType"],
+        "TagSpecifications": [{"ResourceType": "volume", "Tags": tags_list}],
+    }
     if block_device["Encrypted"]:
-        response = ec2_client.create_volume(
-            AvailabilityZone=block_device["AvailabilityZone"],
-            Encrypted=block_device["Encrypted"],
-            KmsKeyId=block_device["KmsKeyId"],
-            Size=block_device["Size"],
-            SnapshotId=snapshot_id,
-            VolumeType=block_device["VolumeType"],
-            TagSpecifications=[{"ResourceType": "volume", "Tags": tags_list}],
-        )
-    else:
-        response = ec2_client.create_volume(
-            AvailabilityZone=block_device["AvailabilityZone"],
-            Encrypted=block_device["Encrypted"],
-            Size=block_device["Size"],
-            SnapshotId=snapshot_id,
-            VolumeType=block_device["VolumeType"],
-            TagSpecifications=[{"ResourceType": "volume", "Tags": tags_list}],
-        )
+        create_volume_params["KmsKeyId"] = block_device["KmsKeyId"]
+
+    response = ec2_client.create_volume(**create_volume_params)
 
     validate_response(response)
     new_volume_id = response["VolumeId"]
     print(
         "Waiting for {} to become ready... ".format(new_volume_id),
     )
-    new_volume_waiter = ec2_client.get_waiter("volume_available")
+    new_volume_waiter = get_waiter(ec2_client, "volume_available")
 
     try:
         new_volume_waiter.wait(
@@ -588,7 +638,7 @@ def toggle_ec2_state(ec2_client, instance_id, state=1, wait_delay=15, wait_attem
         print(
             "Waiting for instance {} to start... ".format(instance_id),
         )
-        running_waiter = ec2_client.get_waiter("instance_running")
+        running_waiter = get_waiter(ec2_client, "instance_running")
 
         try:
             running_waiter.wait(
@@ -617,7 +667,7 @@ def toggle_ec2_state(ec2_client, instance_id, state=1, wait_delay=15, wait_attem
         print(
             "Waiting for instance {} to stop... ".format(instance_id),
         )
-        stop_waiter = ec2_client.get_waiter("instance_stopped")
+        stop_waiter = get_waiter(ec2_client, "instance_stopped")
 
         try:
             stop_waiter.wait(
@@ -653,10 +703,8 @@ def detach_ebs_volume(
     )
 
     validate_response(response)
-    print(
-        "Waiting for volume {} to detach... ".format(volume_id), end="", flush=True
-    )
-    available_waiter = ec2_client.get_waiter("volume_available")
+    print("Waiting for volume {} to detach... ".format(volume_id), end="", flush=True)
+    available_waiter = get_waiter(ec2_client, "volume_available")
 
     try:
         available_waiter.wait(
@@ -696,7 +744,7 @@ def attach_ebs_volume(
     print(
         "Waiting for volume {} to detach... ".format(new_volume_id),
     )
-    in_use_waiter = ec2_client.get_waiter("volume_in_use")
+    in_use_waiter = get_waiter(ec2_client, "volume_in_use")
 
     try:
         in_use_waiter.wait(
@@ -719,6 +767,40 @@ def attach_ebs_volume(
     return True
 
 
+def switch_ebs_volume(ec2_client, instance_id, device_name, block_device):
+    """
+    Switches the original volume attached at device_name on the provided
+    instance ID with the volume restored from its snapshot
+    """
+    detach_ebs_volume(ec2_client, instance_id, block_device["VolumeId"], device_name)
+    attach_ebs_volume(ec2_client, instance_id, block_device["NewVolumeId"], device_name)
+
+
+def map_concurrently(function, items, max_workers=10):
+    """
+    Calls function with each of the items concurrently, returning the results
+    in order. CTRL+C cancels the calls not yet started and exits straight away
+    rather than waiting on the calls already running
+    """
+    if not items:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=min(len(items), max_workers))
+    try:
+        results = list(executor.map(function, items))
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Running worker threads, such as those in a waiter, are still joined
+        # when the interpreter exits, so the process exits without cleanup
+        sys.stdout.flush()
+        sys.stderr.write("\nOperation cancelled by user.\n\n")
+        sys.stderr.flush()
+        os._exit(1)
+
+    executor.shutdown()
+    return results
+
+
 def manage_restore_process(ec2_client, instance_dict, searchtags_dict):
     """
     Primary restore function used to manage the restore process and call
@@ -728,59 +810,143 @@ def manage_restore_process(ec2_client, instance_dict, searchtags_dict):
     for instance_id in instance_dict:
         print("Starting volume restore process for {}".format(instance_id))
         separator()
-        for block_device in instance_dict[instance_id]["BlockDevs"]:
-            new_volume_id = restore_ebs_volume(
-                ec2_client, block_device, searchtags_dict
-            )
+        block_devs = instance_dict[instance_id]["BlockDevs"]
+        if not block_devs:
+            print("No volumes selected for {}, skipping".format(instance_id))
+            continue
+
+        # Volume restores are independent of one another, so run them
+        # concurrently and wait on them together
+        new_volume_ids = map_concurrently(
+            lambda block_dev: restore_ebs_volume(
+                ec2_client, block_dev[0], block_dev[1], searchtags_dict
+            ),
+            block_devs.items(),
+        )
+        for block_device, new_volume_id in zip(block_devs.values(), new_volume_ids):
             block_device.update({"NewVolumeId": new_volume_id})
 
         if instance_dict[instance_id]["SwitchVols"]:
+            # The devices are switched concurrently, so every restore must
+            # have produced a volume before any original volume is detached
+            failed_devices = [
+                device_name
+                for device_name, block_device in block_devs.items()
+                if block_device["NewVolumeId"] is None
+            ]
+            if failed_devices:
+                sys.exit(
+                    "Error: Restore failed for {} on {}, volumes not switched".format(
+                        ", ".join(failed_devices), instance_id
+                    )
+                )
+
             toggle_ec2_state(ec2_client, instance_id, 0)
-            for block_device in instance_dict[instance_id]["BlockDevs"]:
-                volume_id = block_device["VolumeId"]
-                new_volume_id = block_device["NewVolumeId"]
-                device_name = block_device["DeviceName"]
-                detach_ebs_volume(ec2_client, instance_id, volume_id, device_name)
-                attach_ebs_volume(ec2_client, instance_id, new_volume_id, device_name)
+            # Each device is detached and re-attached independently, so the
+            # devices are switched concurrently once the instance has stopped
+            map_concurrently(
+                lambda block_dev: switch_ebs_volume(
+                    ec2_client, instance_id, block_dev[0], block_dev[1]
+                ),
+                block_devs.items(),
+            )
             toggle_ec2_state(ec2_client, instance_id, 1)
 
     separator()
     print("Restore process completed.")
 
 
+"""
+Singular and plural labels for the days, hours and minutes of a plan's age
+"""
+AGE_UNIT_LABELS = (("day", "days"), ("hour", "hours"), ("minute", "minutes"))
+
+
 def seconds_to_dhms(total_seconds):
-    seconds = total_seconds % 60
-    total_minutes = total_seconds // 60
-    total_hours = total_minutes // 60
-    minutes = total_minutes % 60
-    days = total_hours // 24
-    hours = total_hours % 24
-
-    output_string = ""
-    if days > 0:
-        if days == 1:
-            label = "day"
-        else:
-            label = "days"
+    # Plans are usually loaded soon after being saved
+    if total_seconds < 60:
+        return "{} {} ago".format(
+            total_seconds, "second" if total_seconds == 1 else "seconds"
+        )
 
-        output_string += "{} {}, ".format(days, label)
+    total_minutes, seconds = divmod(total_seconds, 60)
+    total_hours, minutes = divmod(total_minutes, 60)
+    days, hours = divmod(total_hours, 24)
 
-    if hours > 0:
-        if hours == 1:
-            label = "hour"
-        else:
-            label = "hours"
-        output_string += "{} {}, ".format(hours, label)
+    output_parts = [
+        "{} {}".format(value, singular if value == 1 else plural)
+        for value, (singular, plural) in zip((days, hours, minutes), AGE_UNIT_LABELS)
+        if value > 0
+    ]
+    output_parts.append(
+        "{} {} ago".format(seconds, "second" if seconds == 1 else "seconds")
+    )
+    return ", ".join(output_parts)
 
-    if minutes > 0:
-        if minutes == 1:
-            label = "minute"
-        else:
-            label = "minutes"
-        output_string += "{} {}, ".format(minutes, label)
 
-    output_string += "{} seconds ago".format(seconds)
-    return output_string
+"""
+Canonical JSON encoding of a plan, used both for writing the plan to file
+and for calculating its checksum
+"""
+PLAN_ENCODER = json.JSONEncoder(
+    sort_keys=True, ensure_ascii=True, separators=(",", ":")
+)
+
+
+def calculate_plan_checksum(plan_dict, algorithm):
+    """
+    Returns the checksum of a plan using the named algorithm. Plans saved
+    before the checksum algorithm was recorded in their metadata use an MD5
+    checksum of the plan serialized with default separators.
+    """
+    if algorithm == "blake2b":
+        return hashlib.blake2b(
+            PLAN_ENCODER.encode(plan_dict).encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    return hashlib.md5(
+        json.dumps(plan_dict, sort_keys=True, ensure_ascii=True).encode("utf-8")
+    ).hexdigest()
+
+
+def calculate_raw_plan_checksum(plan_file_bytes, metadata):
+    """
+    Returns the BLAKE2b checksum of the plan taken directly from the bytes of a
+    plan file laid out as save_plan writes it, avoiding re-serializing the
+    loaded plan. Returns None if the file is not laid out that way, including
+    if anything other than the loaded metadata follows the hashed plan bytes.
+    """
+    plan_start = len(b'{"plan":')
+    plan_end = plan_file_bytes.rfind(b',"metadata":')
+    if not plan_file_bytes.startswith(b'{"plan":') or plan_end == -1:
+        return None
+
+    # The hashed bytes must be the plan that was loaded, so the rest of the
+    # file must be exactly the metadata object and the closing brace. Another
+    # key appended after the metadata, such as a second plan, would otherwise
+    # replace the hashed plan when the file is parsed
+    metadata_bytes = plan_file_bytes[plan_end + len(b',"metadata":') : -1]
+    if not plan_file_bytes.endswith(b"}"):
+        return None
+    try:
+        if plan_loads(metadata_bytes) != metadata:
+            return None
+    except ValueError:
+        return None
+
+    return hashlib.blake2b(
+        memoryview(plan_file_bytes)[plan_start:plan_end], digest_size=16
+    ).hexdigest()
+
+
+"""
+Plans saved to a file name ending in .gz are gzip-compressed at a low
+compression level, and compressed plans are recognised on load by their
+leading magic bytes whatever their file name
+"""
+PLAN_GZIP_SUFFIX = ".gz"
+PLAN_GZIP_LEVEL = 1
+GZIP_MAGIC = b"\x1f\x8b"
 
 
 def save_plan(searchtags_dict, instance_dict, save_file):
@@ -791,32 +957,112 @@ def save_plan(searchtags_dict, instance_dict, save_file):
     print()
     print("Preparing recovery plan...")
 
-    output_dict = {}
-    output_dict.update(
-        {"plan": {"instance_dict": instance_dict, "searchtags_dict": searchtags_dict}}
-    )
-    plan_checksum = hashlib.md5(
-        json.dumps(output_dict["plan"], sort_keys=True, ensure_ascii=True).encode(
-            "utf-8"
-        )
-    ).hexdigest()
-    output_dict.update(
-        {"metadata": {"timestamp": int(time.time()), "checksum": plan_checksum}}
-    )
+    plan_dict = {"instance_dict": instance_dict, "searchtags_dict": searchtags_dict}
+    plan_hash = hashlib.blake2b(digest_size=16)
 
     try:
         print("Saving plan to file: {}".format(save_file))
-        with open(save_file, "w") as f:
-            f.write(json.dumps(output_dict))
+        if save_file.endswith(PLAN_GZIP_SUFFIX):
+            plan_file = gzip.open(save_file, "wt", compresslevel=PLAN_GZIP_LEVEL)
+        else:
+            plan_file = open(save_file, "w")
+
+        with plan_file as f:
+            # Stream the plan to file in chunks, feeding the same chunks to
+            # the checksum, so the plan is only serialized once and never
+            # held in memory as a single string
+            f.write('{"plan":')
+            for chunk in PLAN_ENCODER.iterencode(plan_dict):
+                plan_hash.update(chunk.encode("utf-8"))
+                f.write(chunk)
+
+            f.write(',"metadata":')
+            json.dump(
+                {
+                    "timestamp": int(time.time()),
+                    "checksum": plan_hash.hexdigest(),
+                    "checksum_algorithm": "blake2b",
+                },
+                f,
+                separators=(",", ":"),
+            )
+            f.write("}")
 
-        f.close()
         print()
         print("Plan saved successfully")
 
     except OSError as err:
         sys.exit(err)
-    except FileExistsError as err:
-        sys.exit(err)
+
+
+"""
+Expected keys and value types of each instance, block device and snapshot
+in a loaded plan, and of the block devices in plans saved before they were
+keyed by device name
+"""
+PLAN_SCHEMA = {
+    "instance": {"Name": str, "IPAddress": str, "SwitchVols": bool, "BlockDevs": dict},
+    "block_dev": {
+        "VolumeId": str,
+        "AvailabilityZone": str,
+        "Encrypted": bool,
+        "Size": int,
+        "VolumeType": str,
+        "KmsKeyId": str,
+        "SnapshotData": list,
+    },
+    "snapshot": {"SnapshotId": str, "StartTime": str},
+    "legacy_block_dev": {"DeviceName": str},
+}
+
+
+def validate_plan_element(element, element_type, element_path):
+    """
+    Exits if the provided plan element is missing any of the keys expected for
+    its type in PLAN_SCHEMA, or if any of their values has the wrong type
+    """
+    if type(element) is not dict:
+        sys.exit(
+            "Error: Invalid plan. {} is not a valid data structure".format(element_path)
+        )
+
+    for key, value_type in PLAN_SCHEMA[element_type].items():
+        if not isinstance(element.get(key), value_type):
+            sys.exit(
+                "Error: Invalid plan. {} {} is missing or not a {}".format(
+                    element_path, key, value_type.__name__
+                )
+            )
+
+
+def validate_plan_structure(searchtags_dict, instance_dict):
+    """
+    Validates the structure of a loaded plan once, so the data within can be
+    used without further checks
+    """
+    if type(searchtags_dict) is not dict or type(instance_dict) is not dict:
+        sys.exit("Error: Invalid plan. Expected plan elements are not valid")
+
+    for instance_id, instance_data in instance_dict.items():
+        validate_plan_element(instance_data, "instance", instance_id)
+        if len(instance_data["BlockDevs"]) == 0:
+            sys.exit(
+                "Error: Invalid plan. {} has no block devices selected".format(
+                    instance_id
+                )
+            )
+        for device_name, block_dev in instance_data["BlockDevs"].items():
+            block_dev_path = "{} {}".format(instance_id, device_name)
+            validate_plan_element(block_dev, "block_dev", block_dev_path)
+            if len(block_dev["SnapshotData"]) == 0:
+                sys.exit(
+                    "Error: Invalid plan. {} has no snapshot selected".format(
+                        block_dev_path
+                    )
+                )
+            validate_plan_element(
+                block_dev["SnapshotData"][0], "snapshot", block_dev_path + " snapshot"
+            )
 
 
 def load_plan(load_file):
@@ -831,15 +1077,16 @@ def load_plan(load_file):
 
     try:
         print("Reading plan from file: {}".format(load_file))
-        with open(load_file, "r") as f:
-            input_dict = json.load(f)
+        with open(load_file, "rb") as f:
+            plan_file_bytes = f.read()
+
+        if plan_file_bytes.startswith(GZIP_MAGIC):
+            plan_file_bytes = gzip.decompress(plan_file_bytes)
 
-        f.close()
+        input_dict = plan_loads(plan_file_bytes)
         print("Plan loaded successfully")
 
-    except OSError as err:
-        sys.exit(err)
-    except FileExistsError as err:
+    except (OSError, EOFError, zlib.error) as err:
         sys.exit(err)
 
     print()
@@ -857,14 +1104,43 @@ def load_plan(load_file):
         sys.exit("Error: Invalid plan. Expected plan elements are missing")
 
     metadata_checksum = input_dict["metadata"]["checksum"]
-    plan_checksum = hashlib.md5(
-        json.dumps(input_dict["plan"], sort_keys=True, ensure_ascii=True).encode(
-            "utf-8"
+    checksum_algorithm = input_dict["metadata"].get("checksum_algorithm", "md5")
+    plan_checksum = None
+    if checksum_algorithm == "blake2b":
+        plan_checksum = calculate_raw_plan_checksum(
+            plan_file_bytes, input_dict["metadata"]
         )
-    ).hexdigest()
+
+    # Plans saved with MD5, or files that have since been reformatted, are
+    # checked by re-serializing the loaded plan
+    if plan_checksum != metadata_checksum:
+        plan_checksum = calculate_plan_checksum(input_dict["plan"], checksum_algorithm)
+
     if metadata_checksum != plan_checksum:
         sys.exit("Error: Plan checksum mismatch. Has the plan been modified?")
 
+    # Plans saved before block devices were keyed by device name store them
+    # as a list. Anything else malformed is left for validate_plan_structure
+    # to report
+    instance_dict = input_dict["plan"]["instance_dict"]
+    if type(instance_dict) is dict:
+        for instance_id, instance_data in instance_dict.items():
+            if type(instance_data) is not dict:
+                continue
+            block_devs = instance_data.get("BlockDevs")
+            if type(block_devs) is list:
+                for index, block_dev in enumerate(block_devs):
+                    validate_plan_element(
+                        block_dev,
+                        "legacy_block_dev",
+                        "{} block device {}".format(instance_id, index),
+                    )
+                instance_data["BlockDevs"] = {
+                    block_dev.pop("DeviceName"): block_dev for block_dev in block_devs
+                }
+
+    validate_plan_structure(input_dict["plan"]["searchtags_dict"], instance_dict)
+
     print("Plan validated successfully")
     print()
     plan_age_seconds = int(time.time()) - input_dict["metadata"]["timestamp"]
@@ -872,18 +1148,123 @@ def load_plan(load_file):
     return input_dict["plan"]["searchtags_dict"], input_dict["plan"]["instance_dict"]
 
 
-def verify_instance(ec2_client, plan_instance_id, plan_instance_metadata):
+def paginate_results(ec2_client, operation_name, result_key, **kwargs):
     """
-    Verifies that the provided Instance exists in AWS
-    and that the provided instance data matches
+    Runs the named describe operation through its paginator, validating each
+    page, and returns the combined list of results under the provided key
     """
+    results = []
+    for page in ec2_client.get_paginator(operation_name).paginate(**kwargs):
+        validate_response(page)
+        results.extend(page[result_key])
 
-    print(
-        "Checking Instance ID: {}... ".format(plan_instance_id),
+    return results
+
+
+def describe_by_ids(
+    ec2_client, operation_name, result_key, ids_param, id_filter, ids, filters=()
+):
+    """
+    Describes the resources with the provided IDs. Describing by ID fails
+    outright if any of the IDs no longer exist, so on a NotFound error the
+    resources are described again through an ID filter instead, which leaves
+    out the missing resources so they can be reported with any other mismatch
+    """
+    try:
+        return paginate_results(
+            ec2_client,
+            operation_name,
+            result_key,
+            **{ids_param: ids},
+            Filters=list(filters),
+        )
+    except botocore.exceptions.ClientError as clienterr:
+        if not clienterr.response["Error"]["Code"].endswith(".NotFound"):
+            raise
+
+    return paginate_results(
+        ec2_client,
+        operation_name,
+        result_key,
+        Filters=[*filters, {"Name": id_filter, "Values": ids}],
     )
 
+
+def describe_plan_resources(ec2_client, instance_dict):
+    """
+    Describes every instance, volume and snapshot referenced by the plan
+    with a single call per resource type, returning each set of resources
+    keyed by ID
+    """
+    instance_ids = list(instance_dict)
+    # Instances are filtered on their expected names server-side, so a renamed
+    # instance is missing from the results. An instance without a Name tag
+    # can't be matched by a tag filter, so the filter is only used when every
+    # instance in the plan has a name
+    instance_names = {instance_data["Name"] for instance_data in instance_dict.values()}
+    instance_filters = []
+    if "" not in instance_names:
+        instance_filters.append({"Name": "tag:Name", "Values": sorted(instance_names)})
+
+    # Each ID is only described once, even if it is referenced more than once
+    # in the plan
+    volume_ids = list(
+        dict.fromkeys(
+            block_dev["VolumeId"]
+            for instance_data in instance_dict.values()
+            for block_dev in instance_data["BlockDevs"].values()
+        )
+    )
+    snapshot_ids = list(
+        dict.fromkeys(
+            block_dev["SnapshotData"][0]["SnapshotId"]
+            for instance_data in instance_dict.values()
+            for block_dev in instance_data["BlockDevs"].values()
+        )
+    )
+
+    # The three describe calls are independent, so they are made concurrently
+    # on the shared client
     try:
-        response = ec2_client.describe_instances(InstanceIds=[plan_instance_id])
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            reservations_future = executor.submit(
+                describe_by_ids,
+                ec2_client,
+                "describe_instances",
+                "Reservations",
+                "InstanceIds",
+                "instance-id",
+                instance_ids,
+                instance_filters,
+            )
+            volumes_future = executor.submit(
+                describe_by_ids,
+                ec2_client,
+                "describe_volumes",
+                "Volumes",
+                "VolumeIds",
+                "volume-id",
+                volume_ids,
+            )
+            snapshots_future = executor.submit(
+                describe_by_ids,
+                ec2_client,
+                "describe_snapshots",
+                "Snapshots",
+                "SnapshotIds",
+                "snapshot-id",
+                snapshot_ids,
+            )
+
+        instances = {
+            instance["InstanceId"]: instance
+            for reservation in reservations_future.result()
+            for instance in reservation["Instances"]
+        }
+        volumes = {volume["VolumeId"]: volume for volume in volumes_future.result()}
+        snapshots = {
+            snapshot["SnapshotId"]: snapshot for snapshot in snapshots_future.result()
+        }
 
     except botocore.exceptions.UnauthorizedSSOTokenError as ssotokenerr:
         sys.exit(ssotokenerr)
@@ -891,145 +1272,128 @@ def verify_instance(ec2_client, plan_instance_id, plan_instance_metadata):
     except botocore.exceptions.ProfileNotFound as profileerr:
         sys.exit(profileerr)
 
-    validate_response(response)
-    for reservation in response["Reservations"]:
-        if len(reservation["Instances"]) == 1:
-            for instance in reservation["Instances"]:
-                print("    Verifying Instance Name... ")
-                instance_name = ""
-                for tags in instance["Tags"]:
-                    if tags["Key"] == "Name":
-                        instance_name = tags["Value"]
-
-                if plan_instance_metadata["Name"] != instance_name:
-                    sys.exit(
-                        "Error: Instance name does not match\nPlan: {}, Actual: {}".format(
-                            plan_instance_metadata["Name"], instance_name
-                        )
-                    )
-
-                print("    Verifying Instance IP Address... ")
-                if (
-                    plan_instance_metadata["IPAddress"]
-                    != instance["PrivateIpAddress"]
-                ):
-                    sys.exit(
-                        "Error: Instance IP Address does not match\nPlan: {}, Actual: {}".format(
-                            plan_instance_metadata["IPAddress"],
-                            instance["PrivateIpAddress"],
-                        )
-                    )
+    # Throttling is retried by the client's adaptive retry mode, and missing
+    # resources are described again by filter, so an error reaching here is
+    # either not retryable or has exhausted its retries
+    except botocore.exceptions.ClientError as clienterr:
+        sys.exit(clienterr)
 
-        else:
-            sys.exit(
-                "Error: The instance with Instance ID {} could not be found".format(
-                    plan_instance_id
-                )
-            )
+    return instances, volumes, snapshots
 
 
-def verify_volume(ec2_client, plan_volume_id, plan_volume_metadata):
+class PlanMismatchError(Exception):
     """
-    Verifies that the provided Volume exists in AWS
-    and that the provided volume data matches
+    Raised when a resource in a loaded plan no longer exists in AWS or its
+    data no longer matches the plan
     """
 
-    print("Checking Volume ID: {}... ".format(plan_volume_id))
 
-    try:
-        response = ec2_client.describe_volumes(VolumeIds=[plan_volume_id])
+def verify_resource(
+    resource_type,
+    plan_resource_id,
+    plan_resource_metadata,
+    resource_metadata,
+    verbose=False,
+    missing_detail="",
+):
+    """
+    Verifies that the provided resource exists in AWS and that the provided
+    resource data matches. The resource's data must already be projected onto
+    the plan's keys, or be None if AWS did not return the resource
+    """
 
-    except botocore.exceptions.UnauthorizedSSOTokenError as ssotokenerr:
-        sys.exit(ssotokenerr)
+    print("Checking {} ID: {}... ".format(resource_type, plan_resource_id))
 
-    except botocore.exceptions.ProfileNotFound as profileerr:
-        sys.exit(profileerr)
+    if resource_metadata is None:
+        raise PlanMismatchError(
+            "Error: The {} with {} ID {}{} could not be found".format(
+                resource_type.lower(), resource_type, plan_resource_id, missing_detail
+            )
+        )
 
-    validate_response(response)
-    if len(response["Volumes"]) == 1:
-        for volume in response["Volumes"]:
-            for key in plan_volume_metadata.keys():
+    # Resources are compared in one go, only walking the keys to report on
+    # when verbose or on a mismatch. A single line is printed per verified
+    # resource otherwise
+    if resource_metadata != plan_resource_metadata or verbose:
+        for key in plan_resource_metadata:
+            if verbose:
                 print("    Verifying {}... ".format(key))
-                if key == "DeviceName":
-                    if (
-                        plan_volume_metadata[key]
-                        != volume["Attachments"][0]["Device"]
-                    ):
-                        sys.exit(
-                            "Error: {} does not match\nPlan: {}, Actual: {}".format(
-                                key,
-                                plan_volume_metadata[key],
-                                volume["Attachments"][0]["Device"],
-                            )
-                        )
-                elif plan_volume_metadata[key] != volume[key]:
-                    sys.exit(
-                        "Error: {} does not match\nPlan: {}, Actual: {}".format(
-                            key,
-                            plan_volume_metadata[key],
-                            volume[key],
-                        )
+            if plan_resource_metadata[key] != resource_metadata[key]:
+                raise PlanMismatchError(
+                    "Error: {} {} does not match\nPlan: {}, Actual: {}".format(
+                        plan_resource_id,
+                        key,
+                        plan_resource_metadata[key],
+                        resource_metadata[key],
                     )
+                )
 
-    else:
-        sys.exit(
-            "Error: The volume with Volume ID {} could not be found".format(
-                plan_volume_id
-            )
-        )
+    print("    Verified: {}".format(", ".join(plan_resource_metadata)))
 
 
-def verify_snapshot(ec2_client, plan_snapshot_id, plan_snapshot_metadata):
+def verify_instance(plan_instance_id, plan_instance_metadata, instance, verbose=False):
     """
-    Verifies that the provided Snapshot exists in AWS
-    and that the provided snapshot data matches
+    Verifies that the provided Instance exists in AWS
+    and that the provided instance data matches
     """
+    instance_metadata = None
+    if instance is not None:
+        tag_map = {tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])}
+        instance_metadata = {
+            "Name": tag_map.get("Name", ""),
+            "IPAddress": instance["PrivateIpAddress"],
+        }
 
-    print("Checking Snapshot ID: {}... ".format(plan_snapshot_id))
+    verify_resource(
+        "Instance",
+        plan_instance_id,
+        plan_instance_metadata,
+        instance_metadata,
+        verbose,
+        missing_detail=" and Name {}".format(plan_instance_metadata["Name"]),
+    )
 
-    try:
-        response = ec2_client.describe_snapshots(SnapshotIds=[plan_snapshot_id])
 
-    except botocore.exceptions.UnauthorizedSSOTokenError as ssotokenerr:
-        sys.exit(ssotokenerr)
+def verify_volume(plan_volume_id, plan_volume_metadata, volume, verbose=False):
+    """
+    Verifies that the provided Volume exists in AWS
+    and that the provided volume data matches
+    """
+    volume_metadata = None
+    if volume is not None:
+        volume_metadata = {
+            key: volume["Attachments"][0]["Device"]
+            if key == "DeviceName"
+            else volume.get(key)
+            for key in plan_volume_metadata
+        }
 
-    except botocore.exceptions.ProfileNotFound as profileerr:
-        sys.exit(profileerr)
+    verify_resource(
+        "Volume", plan_volume_id, plan_volume_metadata, volume_metadata, verbose
+    )
 
-    validate_response(response)
-    if len(response["Snapshots"]) == 1:
-        for snapshot in response["Snapshots"]:
-            for key in plan_snapshot_metadata.keys():
-                print("    Verifying {}... ".format(key))
-                if key == "StartTime":
-                    snapshot_starttime = "{}".format(snapshot["StartTime"])
-                    if plan_snapshot_metadata[key] != snapshot_starttime:
-                        sys.exit(
-                            "Error: {} does not match\nPlan: {}, Actual: {}".format(
-                                key,
-                                plan_snapshot_metadata[key],
-                                snapshot_starttime,
-                            )
-                        )
-
-                elif plan_snapshot_metadata[key] != snapshot[key]:
-                    sys.exit(
-                        "Error: {} does not match\nPlan: {}, Actual: {}".format(
-                            key,
-                            plan_snapshot_metadata[key],
-                            snapshot[key],
-                        )
-                    )
 
-    else:
-        sys.exit(
-            "Error: The snapshot with Snapshot ID {} could not be found".format(
-                plan_snapshot_id
-            )
-        )
+def verify_snapshot(plan_snapshot_id, plan_snapshot_metadata, snapshot, verbose=False):
+    """
+    Verifies that the provided Snapshot exists in AWS
+    and that the provided snapshot data matches
+    """
+    snapshot_metadata = None
+    if snapshot is not None:
+        # Plans store the snapshot start time as a string
+        snapshot_metadata = {
+            key: "{}".format(snapshot["StartTime"])
+            if key == "StartTime"
+            else snapshot.get(key)
+            for key in plan_snapshot_metadata
+        }
+
+    verify_resource(
+        "Snapshot", plan_snapshot_id, plan_snapshot_metadata, snapshot_metadata, verbose
+    )
 
 
-def revalidate_loaded_plan(ec2_client, instance_dict):
+def revalidate_loaded_plan(ec2_client, instance_dict, verbose=False):
     """
     Re-validates the provided instance_dict to ensure the supplied
     AWS resource IDs are valid and still exist
@@ -1037,18 +1401,27 @@ def revalidate_loaded_plan(ec2_client, instance_dict):
     print()
     print("Re-validating resource IDs...")
 
+    instances, volumes, snapshots = describe_plan_resources(ec2_client, instance_dict)
+
+    verify_checks = []
     for instance_id in instance_dict:
         instance_metadata = {
             "Name": instance_dict[instance_id]["Name"],
             "IPAddress": instance_dict[instance_id]["IPAddress"],
         }
-        verify_instance(ec2_client, instance_id, instance_metadata)
-        print()
+        verify_checks.append(
+            (
+                verify_instance,
+                instance_id,
+                instance_metadata,
+                instances.get(instance_id),
+            )
+        )
 
-        for block_dev in instance_dict[instance_id]["BlockDevs"]:
+        for device_name, block_dev in instance_dict[instance_id]["BlockDevs"].items():
             volume_id = block_dev["VolumeId"]
             volume_metadata = {
-                "DeviceName": block_dev["DeviceName"],
+                "DeviceName": device_name,
                 "AvailabilityZone": block_dev["AvailabilityZone"],
                 "Encrypted": block_dev["Encrypted"],
                 "Size": block_dev["Size"],
@@ -1058,14 +1431,164 @@ def revalidate_loaded_plan(ec2_client, instance_dict):
             if block_dev["Encrypted"]:
                 volume_metadata.update({"KmsKeyId": block_dev["KmsKeyId"]})
 
-            verify_volume(ec2_client, volume_id, volume_metadata)
-            print()
+            verify_checks.append(
+                (verify_volume, volume_id, volume_metadata, volumes.get(volume_id))
+            )
 
             snapshot_id = block_dev["SnapshotData"][0]["SnapshotId"]
             snapshot_metadata = {"StartTime": block_dev["SnapshotData"][0]["StartTime"]}
 
-            verify_snapshot(ec2_client, snapshot_id, snapshot_metadata)
-            print()
+            verify_checks.append(
+                (
+                    verify_snapshot,
+                    snapshot_id,
+                    snapshot_metadata,
+                    snapshots.get(snapshot_id),
+                )
+            )
+
+    # Every resource is verified before exiting so all of the differences
+    # between the plan and AWS are reported in a single run
+    mismatches = []
+    for verify_function, resource_id, plan_metadata, resource in verify_checks:
+        try:
+            verify_function(resource_id, plan_metadata, resource, verbose)
+        except PlanMismatchError as mismatch:
+            print("    Verification failed")
+            mismatches.append(str(mismatch))
+        print()
+
+    if mismatches:
+        sys.exit("\n\n".join(mismatches))
+
+
+def get_validation_marker(instance_dict, awsprofile, awsregion):
+    """
+    Returns the path of the validation marker file for a plan, named after a
+    signature of the plan contents and the account and region it targets
+    """
+    plan_signature = hashlib.blake2b(
+        PLAN_ENCODER.encode([instance_dict, awsprofile, awsregion]).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+    return os.path.join(VALIDATION_CACHE_DIR, plan_signature)
+
+
+def plan_recently_validated(marker_path, cache_ttl):
+    """
+    Returns True if the plan's validation marker was written within the TTL
+    """
+    try:
+        return time.time() - os.stat(marker_path).st_mtime < cache_ttl
+    except OSError:
+        return False
+
+
+def write_validation_marker(marker_path):
+    """
+    Records a successful re-validation. The cache is only an optimisation, so
+    failing to write the marker is not an error
+    """
+    try:
+        os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+        with open(marker_path, "w"):
+            pass
+    except OSError:
+        pass
+
+
+def remove_validation_marker(marker_path):
+    """
+    Forgets a plan's re-validation, so the next run of the plan always
+    re-validates it against AWS
+    """
+    try:
+        os.remove(marker_path)
+    except OSError:
+        pass
+
+
+def run_loaded_plan(
+    ec2_client, load_file, awsprofile, awsregion, use_cache, cache_ttl, verbose
+):
+    """
+    Loads a saved plan and re-validates it against AWS, unless it was
+    re-validated within the cache TTL
+    """
+    searchtags_dict, instance_dict = load_plan(load_file)
+    separator()
+    marker_path = get_validation_marker(instance_dict, awsprofile, awsregion)
+    if use_cache and plan_recently_validated(marker_path, cache_ttl):
+        print()
+        print(
+            "Plan re-validated within the last {} seconds, skipping".format(cache_ttl)
+        )
+    else:
+        # A stale marker is removed first so a failed re-validation
+        # always forces a fresh one on the next run
+        remove_validation_marker(marker_path)
+        revalidate_loaded_plan(ec2_client, instance_dict, verbose)
+        write_validation_marker(marker_path)
+    separator()
+
+    return searchtags_dict, instance_dict, marker_path
+
+
+def run_new_plan(ec2_client, searchtags_dict, switchvols):
+    """
+    Builds a plan interactively from the instances matching the search tags
+    """
+    instance_dict = query_ec2_instances(ec2_client, searchtags_dict)
+    separator()
+    if len(instance_dict) > 1:
+        instance_dict = get_instance_choice(instance_dict)
+        separator()
+    instance_dict = get_volume_choice(instance_dict)
+    separator()
+
+    # Snapshots are looked up by volume ID alone, so they are described in the
+    # background while the volume data is being queried
+    volume_ids = [
+        block_device["VolumeId"]
+        for instance_id in instance_dict
+        for block_device in instance_dict[instance_id]["BlockDevs"].values()
+    ]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        snapshots_future = executor.submit(
+            describe_volume_snapshots, ec2_client, volume_ids
+        )
+        instance_dict = get_volume_data(ec2_client, instance_dict)
+        separator()
+        instance_dict = query_ebs_snapshots(
+            ec2_client, instance_dict, snapshots_by_volume=snapshots_future.result()
+        )
+    separator()
+    instance_dict = get_snapshot_choice(instance_dict)
+    separator()
+    if switchvols:
+        for instance_id in instance_dict:
+            instance_dict[instance_id].update({"SwitchVols": True})
+    else:
+        instance_dict = get_reattach_choice(instance_dict)
+    separator()
+
+    return instance_dict
+
+
+def run_restore(ec2_client, searchtags_dict, instance_dict, marker_path=None):
+    """
+    Asks the user to confirm the plan and, if confirmed, carries it out
+    """
+    if get_user_confirmation(instance_dict):
+        # The restore changes the resources the plan was validated against,
+        # so a loaded plan's re-validation must not be reused by a later run
+        if marker_path is not None:
+            remove_validation_marker(marker_path)
+        separator()
+        manage_restore_process(ec2_client, instance_dict, searchtags_dict)
+    else:
+        sys.exit("\nOperation cancelled by user.\n")
 
 
 def main():
@@ -1101,26 +1624,46 @@ def main():
         action=argparse.BooleanOptionalAction,
         default=False,
     )
-    parser.add_argument(
+    plan_group = parser.add_mutually_exclusive_group()
+    plan_group.add_argument(
         "--saveplan",
         metavar="saveplan",
         nargs="?",
         help="Take no actions but output a plan to the file specified",
         default=None,
     )
-    parser.add_argument(
+    plan_group.add_argument(
         "--loadplan",
         metavar="loadplan",
         nargs="?",
         help="Load a saved plan from the file specified",
         default=None,
     )
+    parser.add_argument(
+        "--verbose",
+        metavar="verbose",
+        help="Display each attribute checked when re-validating a loaded plan",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="cache",
+        help="Skip re-validating a loaded plan that was re-validated recently",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+    )
+    parser.add_argument(
+        "--cachettl",
+        metavar="cachettl",
+        type=int,
+        help="Seconds a loaded plan's re-validation is cached for. Default: {}".format(
+            VALIDATION_CACHE_TTL
+        ),
+        default=VALIDATION_CACHE_TTL,
+    )
     args = parser.parse_args()
 
-    if args.saveplan is not None and args.loadplan is not None:
-        print("Error: saveplan and loadplan options are mutually exclusive")
-        sys.exit(1)
-
     if args.searchtags is None and args.loadplan is None:
         sys.exit("error: --searchtags not provided")
     elif args.searchtags is not None and args.loadplan is None:
@@ -1131,62 +1674,42 @@ def main():
     given a value via the --profile argument. Values provided via
     command line argument take precedence.
     """
-    if not os.environ.get("AWS_PROFILE") and args.profile == "":
+    awsprofile = args.profile or os.environ.get("AWS_PROFILE", "")
+    if not awsprofile:
         sys.exit("Error: AWS_PROFILE is not set and no profile specified.")
-    elif os.environ.get("AWS_PROFILE") and args.profile == "":
-        awsprofile = os.environ.get("AWS_PROFILE")
-    elif not os.environ.get("AWS_PROFILE") and args.profile != "":
-        awsprofile = args.profile
-    elif os.environ.get("AWS_PROFILE") and args.profile != "":
-        awsprofile = args.profile
-    else:
-        sys.exit("Unexpected error determining AWS Profile.")
 
     """
     Run the main script sequence encapsulated in a try/except so we
     can gracefully capture a CTRL+C if pressed
     """
     try:
-        ec2_client = create_ec2_client(awsprofile, args.region)
-        separator()
-
-        if args.loadplan is not None:
-            searchtags_dict, instance_dict = load_plan(args.loadplan)
-            separator()
-            revalidate_loaded_plan(ec2_client, instance_dict)
-            separator()
-        else:
-            instance_dict = query_ec2_instances(ec2_client, searchtags_dict)
-            separator()
-            if len(Counter(instance_dict)) > 1:
-                instance_dict = get_instance_choice(instance_dict)
-                separator()
-            instance_dict = get_volume_choice(instance_dict)
-            separator()
-            instance_dict = get_volume_data(ec2_client, instance_dict)
-            separator()
-            instance_dict = query_ebs_snapshots(ec2_client, instance_dict)
-            separator()
-            instance_dict = get_snapshot_choice(instance_dict)
-            separator()
-            if args.switchvols:
-                for instance_id in instance_dict:
-                    instance_dict[instance_id].update({"SwitchVols": True})
-            else:
-                instance_dict = get_reattach_choice(instance_dict)
+        # The client is closed on every exit path, including sys.exit and
+        # CTRL+C, so its connection pool is never left open
+        with contextlib.closing(
+            create_ec2_client(awsprofile, args.region)
+        ) as ec2_client:
             separator()
 
-        if args.saveplan is not None:
-            save_plan(searchtags_dict, instance_dict, args.saveplan)
-        else:
-            if get_user_confirmation(instance_dict):
-                separator()
-                manage_restore_process(ec2_client, instance_dict, searchtags_dict)
+            marker_path = None
+            if args.loadplan is not None:
+                searchtags_dict, instance_dict, marker_path = run_loaded_plan(
+                    ec2_client,
+                    args.loadplan,
+                    awsprofile,
+                    args.region,
+                    args.cache,
+                    args.cachettl,
+                    args.verbose,
+                )
             else:
-                ec2_client.close()
-                sys.exit("\nOperation cancelled by user.\n")
+                instance_dict = run_new_plan(
+                    ec2_client, searchtags_dict, args.switchvols
+                )
 
-            ec2_client.close()
+            if args.saveplan is not None:
+                save_plan(searchtags_dict, instance_dict, args.saveplan)
+            else:
+                run_restore(ec2_client, searchtags_dict, instance_dict, marker_path)
 
     except KeyboardInterrupt:
         sys.exit("\nOperation cancelled by user.\n")
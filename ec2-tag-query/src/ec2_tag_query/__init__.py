@@ -5,6 +5,7 @@ import argparse
 import json
 from collections import defaultdict
 from botocore import exceptions as botoexcept
+from botocore.config import Config
 
 """
 A tool for retrieving basic information from the running EC2 instances.
@@ -14,6 +15,30 @@ query region and to display brief or extended details in both text or
 json. Text output will be in columns for density reasons.
 """
 
+"""
+JSON output is rendered with orjson when it is installed, falling back to
+the standard library json module with the same two-space indentation and
+unescaped UTF-8 output
+"""
+try:
+    import orjson
+
+    def dump_json(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+
+except ImportError:
+
+    def dump_json(data):
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+"""
+EC2 client configuration, matching ebs-recover-and-replace. Adaptive
+retries back off when EC2 throttles requests, so paging through a large
+fleet doesn't fail part way through
+"""
+EC2_CLIENT_CONFIG = Config(retries={"mode": "adaptive", "max_attempts": 10})
+
 
 def confirm_settings(TagName, TagValue, Region, Profile, Output):
     message = """
@@ -35,57 +60,66 @@ Output Mode: {}
 
 
 def get_ec2_instances(TagName, TagValue, Region, Profile, OutputMode, Extended):
-
     try:
         # Connect to EC2
         session = boto3.Session(profile_name=Profile)
-        ec2 = session.resource("ec2", Region)
+        ec2 = session.client("ec2", Region, config=EC2_CLIENT_CONFIG)
 
-        # Get information for all running instances
-        running_instances = ec2.instances.filter(
-            Filters=[{"Name": "tag:" + TagName, "Values": [TagValue]}]
+        # Get information for all running instances, a page at a time so
+        # each page is processed as it arrives
+        pages = ec2.get_paginator("describe_instances").paginate(
+            Filters=[{"Name": "tag:" + TagName, "Values": [TagValue]}],
+            PaginationConfig={"PageSize": 100},
+        )
+        running_instances = (
+            instance
+            for page in pages
+            for reservation in page["Reservations"]
+            for instance in reservation["Instances"]
         )
 
         ec2info = defaultdict()
+        data_width = 0
         for instance in running_instances:
-            for tag in instance.tags:
-                if tag["Key"] == "Name":
-                    name = tag["Value"]
-
-                hostname = "Undefined"
-                if "HostName" in tag["Key"]:
-                    hostname = tag["Value"]
-
-                privateip = "Undefined"
-                if instance.private_ip_address != None:
-                    privateip = instance.private_ip_address
+            instance_id = instance["InstanceId"]
+
+            # Map the instance's tags once rather than re-checking every tag
+            tag_map = {tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])}
+            name = tag_map.get("Name", "")
+            hostname = next(
+                (value for key, value in tag_map.items() if "HostName" in key),
+                "Undefined",
+            )
 
-                publicip = "Undefined"
-                if instance.public_ip_address != None:
-                    publicip = instance.public_ip_address
+            privateip = instance.get("PrivateIpAddress", "Undefined")
+            publicip = instance.get("PublicIpAddress", "Undefined")
 
-                # Render datetime object
-                launchtime = "{}".format(instance.launch_time)
+            # Render datetime object
+            launchtime = "{}".format(instance["LaunchTime"])
 
             # Add instance info to a dictionary
             if Extended:
-                ec2info[instance.id] = {
-                    "Instance Id": instance.id,
+                instance_data = {
+                    "Instance Id": instance_id,
                     "Name": name,
                     "HostName": hostname,
                     "Private IP": privateip,
                     "Public IP": publicip,
-                    "Type": instance.instance_type,
-                    "State": instance.state["Name"],
+                    "Type": instance["InstanceType"],
+                    "State": instance["State"]["Name"],
                     "Launch Time": launchtime,
                 }
             else:
-                ec2info[instance.id] = {
-                    "Instance Id": instance.id,
+                instance_data = {
+                    "Instance Id": instance_id,
                     "Name": name,
                     "Private IP": privateip,
-                    "State": instance.state["Name"],
+                    "State": instance["State"]["Name"],
                 }
+            ec2info[instance_id] = instance_data
+
+            # Track the longest value as rows are added for the text columns
+            data_width = max(data_width, *map(len, instance_data.values()))
 
     except botoexcept.NoCredentialsError as nocrederr:
         sys.exit(nocrederr)
@@ -97,18 +131,11 @@ def get_ec2_instances(TagName, TagValue, Region, Profile, OutputMode, Extended):
         sys.exit(profileerr)
 
     if OutputMode == "json":
-        print(json.dumps(ec2info, indent=4))
+        print(dump_json(ec2info))
     else:
-        # Determine column width by checking string lengths + 2 characters for padding
-        if len(ec2info.items()) > 0:
-            col_width = (
-                max(
-                    len(data_value)
-                    for instance_id, instance_data in ec2info.items()
-                    for data_key, data_value in instance_data.items()
-                )
-                + 2
-            )
+        if ec2info:
+            # Column width is the longest value + 2 characters for padding
+            col_width = data_width + 2
 
             # Set up column headers
             if Extended:
@@ -130,13 +157,14 @@ def get_ec2_instances(TagName, TagValue, Region, Profile, OutputMode, Extended):
             print("".join(col_header.ljust(col_width) for col_header in col_headers))
             print("=" * (col_width * len(col_headers)))
 
-            for instance_id, instance_data in ec2info.items():
-                print(
-                    "".join(
-                        data_value.ljust(col_width)
-                        for data_key, data_value in instance_data.items()
-                    )
+            # Rows are joined and written in a single call rather than
+            # printing each row separately
+            print(
+                "\n".join(
+                    "".join(data_value.ljust(col_width) for data_value in row.values())
+                    for row in ec2info.values()
                 )
+            )
 
         else:
             # No results returned
@@ -148,7 +176,7 @@ def get_ec2_instances(TagName, TagValue, Region, Profile, OutputMode, Extended):
 
 def main():
     # Double-check we're running with at least Python 3.9
-    if sys.version_info < (3,9):
+    if sys.version_info < (3, 9):
         sys.exit("Error: Python 3.9 or higher is required.")
 
     # Parse command line arguments/options
@@ -195,16 +223,9 @@ def main():
     # Check to ensure user's AWS_PROFILE env var is set or we've been
     # given a value via the --profile argument. Values provided via
     # command line argument take precedence.
-    if not os.environ.get("AWS_PROFILE") and args.profile == "":
+    awsprofile = args.profile or os.environ.get("AWS_PROFILE", "")
+    if not awsprofile:
         sys.exit("Error: AWS_PROFILE is not set and no profile specified.")
-    elif os.environ.get("AWS_PROFILE") and args.profile == "":
-        awsprofile = os.environ.get("AWS_PROFILE")
-    elif not os.environ.get("AWS_PROFILE") and args.profile != "":
-        awsprofile = args.profile
-    elif os.environ.get("AWS_PROFILE") and args.profile != "":
-        awsprofile = args.profile
-    else:
-        sys.exit("Unexpected error determining AWS Profile.")
 
     # Confirm script settings before continuing
     if args.confirm:
@@ -218,5 +239,6 @@ def main():
     except KeyboardInterrupt:
         sys.exit("\nOperation cancelled by user.\n")
 
+
 if __name__ == "__main__":
     main()